@@ -1,12 +1,44 @@
-from data_loader import load_data  # Assuming load_data is defined in data_loader.py
+from data_loader import hash_column, hash_rows, load_data  # Assuming load_data is defined in data_loader.py
+from zscore_outliers import numeric_matrix, outlier_rows, zscore_stats
 import pandas as pd
 import numpy as np
+from collections import namedtuple
+from functools import partial, singledispatch
 
+# Optional backends: clean_data gets a specialization for each one that is installed
+try:
+    import dask
+    import dask.dataframe as dd
+except ImportError:
+    dd = None
 
-def clean_data(df, options={"method": "dropna", "threshold": 3.0}):
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+
+# Under Copy-on-Write, no-op results (e.g. dropna/fillna with nothing to change) and column
+# subsets share data with their source until written; it is always on from pandas 3.0,
+# where the option is deprecated.
+# Under it to_numpy() may return a read-only view, so arrays written in place (e.g. by
+# np.clip(..., out=X)) must be requested with copy=True
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# Per-column diagnostics gathered by scan_columns in a single traversal of the DataFrame
+ColumnScan = namedtuple("ColumnScan", ["missing_counts", "row_missing", "row_hashes"])
+
+
+@singledispatch
+def clean_data(df, options={"method": "dropna", "threshold": 3.0}, verbose=False):
     """
     Cleans a DataFrame by handling missing values, duplicates, outliers, and other errors.
 
+    Dispatches on the type of df: pandas DataFrames are handled here, Dask DataFrames by
+    clean_dask_data and PyArrow Tables by clean_arrow_data.
+
     Args:
         df (pd.DataFrame): The DataFrame to clean.
         options (dict, optional): A dictionary specifying parameters for cleaning.
@@ -14,27 +46,40 @@ def clean_data(df, options={"method": "dropna", "threshold": 3.0}):
                 - "dropna": Drop rows with missing values.
                 - "fillna": Fill missing values with a strategy (e.g., mean, median).
             - threshold (float, optional): The threshold for identifying outliers using z-scores.
+            - outliers (str, optional): The method to handle outliers, if any.
+                - "winsorize": Clip numeric values to within `threshold` standard deviations
+                  of the column mean.
+        verbose (bool, optional): Print a preview (head, shape and dtypes) of the initial and
+            cleaned DataFrames. Off by default, since formatting large frames is slow.
 
     Returns:
         pd.DataFrame: The cleaned DataFrame.
     """
 
-    print("Initial DataFrame:")
-    print(df)
+    if verbose:
+        print("Initial DataFrame:")
+        print_preview(df)
 
-    # Check for missing values
-    missing_counts = df.isnull().sum()
+    # Check for missing values (and hash rows for the duplicate check in the same pass)
+    scan = scan_columns(df)
+    missing_counts = scan.missing_counts
     print("\nMissing values per column:")
     print(missing_counts)
 
     # Handle missing values based on options
+    row_hashes = scan.row_hashes
     if missing_counts.any():
         if options["method"] == "dropna":
-            cleaned_df = df.dropna()
+            # Take the complete rows using the scan's row mask; unlike dropna() this does not
+            # re-run isna() over the whole frame
+            keep = ~scan.row_missing
+            cleaned_df = df.loc[keep]
+            row_hashes = row_hashes[keep]
             print("\nDropped rows with missing values:", df.shape[0] - cleaned_df.shape[0])
         elif options["method"] == "fillna":
             # Implement appropriate filling strategy based on column types and distributions
             cleaned_df = df.fillna(...)  # Replace `...` with specific imputation techniques
+            row_hashes = hash_rows(cleaned_df)  # Filled values change the row hashes
             print("\nFilled missing values using specified strategy")
         else:
             raise ValueError("Invalid method for handling missing values.")
@@ -42,7 +87,7 @@ def clean_data(df, options={"method": "dropna", "threshold": 3.0}):
         cleaned_df = df
 
     # Check for duplicate rows
-    duplicate_count = cleaned_df.duplicated().sum()
+    duplicate_count = len(row_hashes) - np.unique(row_hashes).size
     print("\nNumber of duplicate rows:", duplicate_count)
 
     # Handle duplicate rows (optional)
@@ -54,29 +99,337 @@ def clean_data(df, options={"method": "dropna", "threshold": 3.0}):
         print("\nNo duplicate rows found.")
 
     # Identify potential outliers using z-scores
-    z_scores = cleaned_df.apply(pd.Series.zscore)  # Calculate z-scores for each column
-    abs_z_scores = z_scores.abs()
-    potential_outliers = abs_z_scores[abs_z_scores > options["threshold"]]
-    outlier_indices = potential_outliers.any(axis=1)
-    outlier_count = outlier_indices.sum()
+    # Computed by a compiled kernel over the numeric sub-matrix (Numba needs plain arrays)
+    numeric_df = cleaned_df.select_dtypes(include=np.number)
+    X = numeric_matrix(numeric_df)
+    mu, sd = zscore_stats(X)
+    outlier_indices = outlier_rows(X, mu, sd, options["threshold"])
+    outlier_count = int(outlier_indices.sum())
     print("\nPotential outliers based on z-scores (absolute value > {}):".format(options["threshold"]))
     print(outlier_count)
 
     # Handle outliers (optional)
     if outlier_count > 0:
-        # Decide on a strategy based on criteria (e.g., remove, winsorize, robust methods)
-        # `cleaned_df = cleaned_df[~outlier_indices]`  # Example: remove outliers
-        print("\nOutliers not handled in this example.")
+        if options.get("outliers") == "winsorize":
+            # One branchless in-place clip over a fresh float64 copy of the numeric columns
+            # (without copy=True, Copy-on-Write may hand back a read-only view of df's data)
+            X = numeric_df.to_numpy(dtype=np.float64, copy=True)
+            limit = options["threshold"] * sd
+            lo, hi = mu - limit, mu + limit
+            clipped = np.flatnonzero(((X < lo) | (X > hi)).any(axis=0))
+            np.clip(X, lo, hi, out=X)
+            cleaned_df = cleaned_df.copy(deep=False)  # Never write into the caller's DataFrame
+            # Only clipped columns are written back; float columns keep their dtype and backend,
+            # integer ones become float64 since the bounds are fractional
+            for j in clipped:
+                values = pd.Series(X[:, j], index=cleaned_df.index)
+                if numeric_df.dtypes.iloc[j].kind == "f":
+                    values = values.astype(numeric_df.dtypes.iloc[j])
+                cleaned_df[numeric_df.columns[j]] = values
+            print("\nWinsorized outliers to within {} standard deviations.".format(options["threshold"]))
+        else:
+            # Decide on a strategy based on criteria (e.g., remove, winsorize, robust methods)
+            # `cleaned_df = cleaned_df[~outlier_indices]`  # Example: remove outliers
+            print("\nOutliers not handled in this example.")
     else:
         print("\nNo outliers identified based on specified threshold.")
 
     # (Optional) Perform additional cleaning steps such as transformations or visualizations
 
-    print("\nCleaned DataFrame:")
-    print(cleaned_df)
+    if verbose:
+        print("\nCleaned DataFrame:")
+        print_preview(cleaned_df)
 
     return cleaned_df
 
+def print_preview(df):
+    """
+    Prints the first rows, shape and column types of a DataFrame without formatting all of it.
+    """
+
+    print(df.head())
+    print("Shape:", df.shape)
+    print(df.dtypes)
+
+def scan_columns(df):
+    """
+    Walks the DataFrame once, column by column, collecting the missing-value and
+    duplicate-row diagnostics used by clean_data.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to scan.
+
+    Returns:
+        ColumnScan: A namedtuple with
+            - missing_counts (pd.Series): Number of missing values per column.
+            - row_missing (np.ndarray): True for rows with at least one missing value.
+            - row_hashes (np.ndarray): A uint64 hash of each row's values; equal rows hash equally.
+    """
+
+    n_rows = df.shape[0]
+    missing_counts = np.zeros(df.shape[1], dtype=np.int64)
+    row_missing = np.zeros(n_rows, dtype=bool)
+    row_hashes = np.zeros(n_rows, dtype=np.uint64)
+
+    split_missing = df.shape[1] == 1  # As DataFrame.duplicated() does
+    for j in range(df.shape[1]):
+        arr = df.iloc[:, j].to_numpy()
+        isna = pd.isna(arr)
+        missing_counts[j] = isna.sum()
+        row_missing |= isna
+        # Order-dependent combine so rows with the same values in different columns differ
+        row_hashes = row_hashes * np.uint64(1000003) ^ hash_column(arr, split_missing)
+
+    return ColumnScan(pd.Series(missing_counts, index=df.columns), row_missing, row_hashes)
+
+def partition_outlier_mask(partition, mu, sd, threshold):
+    """
+    Flags the rows of one Dask partition whose absolute z-score exceeds the threshold
+    in any column, using statistics computed over the whole DataFrame.
+    """
+
+    # Work one column at a time, reusing two (n_rows,) buffers and OR-ing into the row mask,
+    # so no (n_rows, n_cols) temporaries are allocated
+    n_rows = partition.shape[0]
+    row_mask = np.zeros(n_rows, dtype=bool)
+    z_scores = np.empty(n_rows, dtype=np.float64)
+    is_outlier = np.empty(n_rows, dtype=bool)
+    for j in range(partition.shape[1]):
+        column = partition.iloc[:, j].to_numpy(dtype=np.float64, copy=False)
+        np.subtract(column, mu[j], out=z_scores)
+        np.divide(z_scores, sd[j], out=z_scores)
+        np.abs(z_scores, out=z_scores)
+        np.greater(z_scores, threshold, out=is_outlier)
+        row_mask |= is_outlier
+    return pd.Series(row_mask, index=partition.index)
+
+def partition_winsorize(partition, columns, lo, hi):
+    """
+    Clips the given columns of one Dask partition to [lo, hi], column by column. Float
+    columns keep their dtype; integer ones become float64 since the bounds are fractional.
+    """
+
+    partition = partition.copy(deep=False)
+    for name, low, high in zip(columns, lo, hi):
+        column = partition[name]
+        values = pd.Series(np.clip(column.to_numpy(dtype=np.float64), low, high), index=partition.index)
+        if column.dtype.kind == "f":
+            values = values.astype(column.dtype)
+        partition[name] = values
+    return partition
+
+def dask_frame_stats(df, numeric_cols):
+    """
+    Builds the lazy row count, distinct row count and numeric column means and standard
+    deviations (ddof=0) of a Dask DataFrame, for evaluation with dask.compute.
+    """
+
+    return (
+        df.shape[0],
+        df.drop_duplicates().shape[0],
+        df[numeric_cols].mean(),
+        df[numeric_cols].std(ddof=0),
+    )
+
+def clean_dask_data(df, options={"method": "dropna", "threshold": 3.0}, verbose=False):
+    """
+    Cleans a Dask DataFrame the same way as clean_data, building the cleaning steps as
+    one task graph so each pass over the partitions runs in parallel on the cluster.
+
+    Args:
+        df (dask.dataframe.DataFrame): The DataFrame to clean.
+        options (dict, optional): Cleaning parameters, as for clean_data.
+        verbose (bool, optional): Print the task graph structure of the initial and cleaned DataFrames.
+
+    Returns:
+        dask.dataframe.DataFrame: The cleaned (still lazy) DataFrame.
+    """
+
+    if verbose:
+        print("Initial DataFrame:")
+        print(df)
+
+    # Missing values, row counts, duplicates and column statistics in a single compute;
+    # dropna() is a no-op on a frame without missing values, so its statistics are valid
+    # whether or not anything gets dropped
+    cleaned_df = df.dropna() if options["method"] == "dropna" else df
+    numeric_cols = list(cleaned_df.select_dtypes(include=np.number).columns)
+    non_null_counts, n_rows, (n_cleaned, n_unique, mu, sd) = dask.compute(
+        df.count(),
+        df.shape[0],
+        dask_frame_stats(cleaned_df, numeric_cols),
+    )
+    missing_counts = n_rows - non_null_counts
+    print("\nMissing values per column:")
+    print(missing_counts)
+
+    # Handle missing values based on options
+    if missing_counts.any():
+        if options["method"] == "dropna":
+            print("\nDropped rows with missing values:", n_rows - n_cleaned)
+        elif options["method"] == "fillna":
+            # Implement appropriate filling strategy based on column types and distributions
+            cleaned_df = df.fillna(...)  # Replace `...` with specific imputation techniques
+            n_cleaned, n_unique, mu, sd = dask.compute(*dask_frame_stats(cleaned_df, numeric_cols))
+            print("\nFilled missing values using specified strategy")
+        else:
+            raise ValueError("Invalid method for handling missing values.")
+    else:
+        cleaned_df = df
+
+    duplicate_count = n_cleaned - n_unique
+    print("\nNumber of duplicate rows:", duplicate_count)
+    if duplicate_count > 0:
+        print("\nDuplicate rows not handled in this example.")
+    else:
+        print("\nNo duplicate rows found.")
+
+    # Identify potential outliers using z-scores against the global statistics
+    mu = mu.to_numpy(dtype=np.float64)
+    sd = sd.to_numpy(dtype=np.float64, copy=True)
+    sd[sd == 0] = 1  # Constant columns have no outliers
+    outlier_indices = cleaned_df[numeric_cols].map_partitions(
+        partial(partition_outlier_mask, mu=mu, sd=sd, threshold=options["threshold"]),
+        meta=(None, bool),
+    )
+    # Column minima and maxima ride along with the mask pass, to find the columns to winsorize
+    outlier_count, col_min, col_max = dask.compute(
+        outlier_indices.sum(),
+        cleaned_df[numeric_cols].min(),
+        cleaned_df[numeric_cols].max(),
+    )
+    outlier_count = int(outlier_count)
+    print("\nPotential outliers based on z-scores (absolute value > {}):".format(options["threshold"]))
+    print(outlier_count)
+
+    if outlier_count > 0:
+        if options.get("outliers") == "winsorize":
+            limit = options["threshold"] * sd
+            lo, hi = mu - limit, mu + limit
+            clipped = np.flatnonzero((col_min.to_numpy(dtype=np.float64) < lo) | (col_max.to_numpy(dtype=np.float64) > hi))
+            cleaned_df = cleaned_df.map_partitions(
+                partial(
+                    partition_winsorize,
+                    columns=[numeric_cols[j] for j in clipped],
+                    lo=lo[clipped],
+                    hi=hi[clipped],
+                ),
+            )
+            print("\nWinsorized outliers to within {} standard deviations.".format(options["threshold"]))
+        else:
+            print("\nOutliers not handled in this example.")
+    else:
+        print("\nNo outliers identified based on specified threshold.")
+
+    if verbose:
+        print("\nCleaned DataFrame:")
+        print(cleaned_df)
+
+    return cleaned_df
+
+def clean_arrow_data(table, options={"method": "dropna", "threshold": 3.0}, verbose=False):
+    """
+    Cleans a PyArrow Table the same way as clean_data, using Arrow's own compute kernels
+    instead of converting to pandas.
+
+    Args:
+        table (pa.Table): The Table to clean.
+        options (dict, optional): Cleaning parameters, as for clean_data; only the "dropna"
+            method is supported for missing values.
+        verbose (bool, optional): Print the first rows and schema of the initial and cleaned Tables.
+
+    Returns:
+        pa.Table: The cleaned Table.
+
+    Raises:
+        ValueError: If options["method"] is not "dropna".
+    """
+
+    if options["method"] != "dropna":
+        raise ValueError("Invalid method for handling missing values with Arrow tables; use \"dropna\".")
+
+    if verbose:
+        print("Initial Table:")
+        print(table.slice(0, 5))
+
+    # Treat float NaN as missing, as pandas does, by turning it into null
+    for j, field in enumerate(table.schema):
+        if pa.types.is_floating(field.type):
+            column = table.column(j)
+            table = table.set_column(j, field, pc.if_else(pc.is_nan(column), None, column))
+
+    # Check for missing values; Arrow keeps null counts with each column
+    missing_counts = pd.Series([column.null_count for column in table.columns], index=table.column_names)
+    print("\nMissing values per column:")
+    print(missing_counts)
+
+    # Handle missing values
+    if missing_counts.any():
+        cleaned_table = table.drop_null()
+        print("\nDropped rows with missing values:", table.num_rows - cleaned_table.num_rows)
+    else:
+        cleaned_table = table
+
+    # Check for duplicate rows: every distinct row forms one group
+    n_unique = cleaned_table.group_by(cleaned_table.column_names).aggregate([]).num_rows
+    duplicate_count = cleaned_table.num_rows - n_unique
+    print("\nNumber of duplicate rows:", duplicate_count)
+    if duplicate_count > 0:
+        print("\nDuplicate rows not handled in this example.")
+    else:
+        print("\nNo duplicate rows found.")
+
+    # Identify potential outliers using z-scores, OR-ing one column at a time into the row mask
+    threshold = options["threshold"]
+    numeric_names = [
+        field.name for field in cleaned_table.schema
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+    ]
+    bounds = {}  # Clip bounds, only for columns that have outliers
+    outlier_indices = pa.array(np.zeros(cleaned_table.num_rows, dtype=bool))
+    for name in numeric_names:
+        column = pc.cast(cleaned_table.column(name), pa.float64())
+        mu = pc.mean(column).as_py()
+        sd = pc.stddev(column, ddof=0).as_py()
+        if mu is None:
+            continue  # All values missing
+        sd = sd or 1.0  # Constant columns have no outliers
+        is_outlier = pc.fill_null(pc.greater(pc.abs(pc.divide(pc.subtract(column, mu), sd)), threshold), False)
+        if pc.any(is_outlier).as_py():
+            bounds[name] = (mu - threshold * sd, mu + threshold * sd)
+        outlier_indices = pc.or_(outlier_indices, is_outlier)
+    outlier_count = pc.sum(outlier_indices).as_py() or 0
+    print("\nPotential outliers based on z-scores (absolute value > {}):".format(threshold))
+    print(outlier_count)
+
+    # Handle outliers (optional)
+    if outlier_count > 0:
+        if options.get("outliers") == "winsorize":
+            # Float columns keep their type; integer ones become double since the bounds are fractional
+            for name, (lo, hi) in bounds.items():
+                original = cleaned_table.column(name)
+                column = pc.cast(original, pa.float64())
+                clipped = pc.max_element_wise(pc.min_element_wise(column, hi), lo)
+                if pa.types.is_floating(original.type):
+                    clipped = pc.cast(clipped, original.type)
+                cleaned_table = cleaned_table.set_column(cleaned_table.schema.get_field_index(name), name, clipped)
+            print("\nWinsorized outliers to within {} standard deviations.".format(threshold))
+        else:
+            print("\nOutliers not handled in this example.")
+    else:
+        print("\nNo outliers identified based on specified threshold.")
+
+    if verbose:
+        print("\nCleaned Table:")
+        print(cleaned_table.slice(0, 5))
+
+    return cleaned_table
+
+if dd is not None:
+    clean_data.register(dd.DataFrame, clean_dask_data)
+if pa is not None:
+    clean_data.register(pa.Table, clean_arrow_data)
+
 # # Example usage
 # data = ...  # Load your data here
 # options = {"method": "fillna", "threshold": 2.5}  # Customize cleaning options
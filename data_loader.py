@@ -2,10 +2,24 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import os
-from scipy import stats
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 import datetime
 import mimetypes  # Add for MIME-based inference
 import filetype  # Add for content-based inference
+from zscore_outliers import numeric_matrix, zscore_outlier_mask
+
+# File formats load_data can read; a matching extension is trusted without further inference
+SUPPORTED_FORMATS = ('csv', 'xlsx', 'json')
+
+# Bytes of file header read for content-based inference (filetype needs at most 261)
+HEADER_BYTES = 4096
+
+# Shared Dask cluster client, started on first use of the "dask" backend
+_dask_client = None
 
 
 
@@ -43,15 +57,35 @@ def validate_file_path(file_path):
     # If all checks pass, return True
     return True
 
-def load_data(file_path):
+def get_dask_client():
+    """
+    Returns the shared Dask client, starting a local cluster with one single-threaded
+    worker per CPU core on first use.
+
+    Returns:
+        distributed.Client: The client connected to the local cluster.
+    """
+
+    global _dask_client
+    if _dask_client is None:
+        from dask.distributed import Client, LocalCluster
+
+        cluster = LocalCluster(n_workers=os.cpu_count(), threads_per_worker=1)
+        _dask_client = Client(cluster)
+    return _dask_client
+
+def load_data(file_path, backend="pandas"):
     """
     Loads the dfset from the user's input file path, supporting CSV, Excel, JSON, and potentially more.
 
     Args:
         file_path (str): The file path of the dfset.
+        backend (str, optional): The DataFrame library to load into.
+            - "pandas": Read the whole file into memory.
+            - "dask": Read CSV files lazily in 64MB partitions for out-of-core processing.
 
     Returns:
-        pd.dataFrame: The loaded dfFrame.
+        pd.dataFrame: The loaded dfFrame (a dask.dataframe.DataFrame for the "dask" backend).
 
     Raises:
         ValueError: If the file format is not supported or the file path is invalid.
@@ -59,15 +93,29 @@ def load_data(file_path):
  # Attempt file format inference using multiple methods:
     file_format = try_infer_format(file_path)
 
-    if file_format in ('csv', 'xlsx', 'json'):
+    if backend == 'dask':
+        if file_format != 'csv':
+            raise ValueError(f'Unsupported file format for the dask backend: {file_format}. Please use CSV.')
+        import dask.dataframe as dd
+
+        get_dask_client()
+        return dd.read_csv(file_path, blocksize="64MB")
+    elif backend != 'pandas':
+        raise ValueError(f'Unsupported backend: {backend}. Please use "pandas" or "dask".')
+
+    if file_format in SUPPORTED_FORMATS:
+        # The pyarrow CSV engine reports empty files as a generic ParserError, so check up front
+        if is_blank_file(file_path):
+            raise ValueError(f"File '{file_path}' is empty.")
         try:
             if file_format == 'csv':
-                df = pd.read_csv(file_path)
+                # Multithreaded Arrow parser, producing Arrow-backed columns (no Python string objects)
+                df = pd.read_csv(file_path, engine="pyarrow", dtype_backend="pyarrow")
             elif file_format == 'xlsx':
                 df = pd.read_excel(file_path)
             elif file_format == 'json':
                 df = pd.read_json(file_path)
-        except pd.errors.EmptydfError:
+        except pd.errors.EmptyDataError:
             raise ValueError(f"File '{file_path}' is empty.")
     else:
         raise ValueError(f'Unsupported file format: {file_format}. Please use CSV, Excel, JSON, or provide the format manually.')
@@ -77,23 +125,54 @@ def load_data(file_path):
 
     return df
 
+def is_blank_file(file_path):
+    """
+    Checks whether a file is empty or holds only whitespace. Only files of at most
+    HEADER_BYTES bytes are read; anything larger is treated as having content.
+    """
+
+    if os.path.getsize(file_path) > HEADER_BYTES:
+        return False
+    with open(file_path, 'rb') as f:
+        return not f.read().strip()
+
 def try_infer_format(file_path):
     """
     Attempts to infer the file format using multiple methods.
+    Results are cached per file path and modification time.
+    """
+
+    try:
+        mtime = os.path.getmtime(file_path)
+    except OSError:
+        mtime = None
+    return infer_format_cached(file_path, mtime)
+
+@lru_cache(maxsize=128)
+def infer_format_cached(file_path, mtime):
+    """
+    Infers the file format, cached on (file_path, mtime) so a modified file is re-inspected.
     """
 
-    # 1. Use MIME-based inference:
+    # 1. Trust a supported extension, which needs no file access:
+    extension = os.path.splitext(file_path)[1].lower().lstrip('.')
+    if extension in SUPPORTED_FORMATS:
+        return extension
+
+    # 2. Use MIME-based inference:
     mime_type, _ = mimetypes.guess_type(file_path)
     if mime_type:
         file_format = mime_type.split('/')[1]
         return file_format
 
-    # 2. Use content-based inference:
-    kind = filetype.guess(file_path)
+    # 3. Use content-based inference on the file header only:
+    with open(file_path, 'rb') as f:
+        header = f.read(HEADER_BYTES)
+    kind = filetype.guess(header)
     if kind:
         return kind.extension
 
-    # 3. Fallback to extension-based method:
+    # 4. Fallback to extension-based method:
     return file_path.split('.')[-1].lower()
 
 def inspect_data(df, columns_for_corr=None, columns_for_skewness=None):
@@ -111,20 +190,25 @@ def inspect_data(df, columns_for_corr=None, columns_for_skewness=None):
         None. The function only prints the results to the console.
     """
 
-    # Step 1: Print basic information
-    print_basic_info(df)
+    # Select the numerical columns once for every stage that needs them
+    num_view = df.select_dtypes(include=np.number)
 
+    # Steps 1-4 only read the df and print, so they run concurrently (pandas releases the GIL
+    # while aggregating); their output is still printed in step order
+    # Step 1: Print basic information
     # Step 2: Check for missing values
-    check_missing_values(df)
-
     # Step 3: Print summary statistics for numerical columns
-    print_summary_stats(df)
-
     # Step 4: Check for duplicate rows
-    check_duplicate_rows(df)
-
+    run_stages_in_parallel(df, (
+        print_basic_info,
+        check_missing_values,
+        partial(print_summary_stats, num_view=num_view),
+        check_duplicate_rows,
+    ))
+
+    # Steps 5 onwards plot with matplotlib, which is not thread-safe, so they stay on this thread
     # Step 5: Check for outliers using z-scores and box plots
-    check_outliers(df)
+    check_outliers(df, num_view)
 
     # Step 6: Check for df ranges or patterns (customizable)
     check_df_ranges(df)
@@ -138,11 +222,62 @@ def inspect_data(df, columns_for_corr=None, columns_for_skewness=None):
         check_skewness(df, columns_for_skewness)
 
     # Step 9: Perform visual exploration
-    perform_visual_exploration(df)
+    perform_visual_exploration(df, num_view)
 
     # Step 10: Perform time series analysis (placeholder)
     perform_time_series_analysis(df)
 
+class ThreadOutput(io.TextIOBase):
+    """
+    A stand-in for sys.stdout that sends each thread's writes to that thread's own buffer,
+    falling back to the real stream for threads without one.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def capture(self, stage, df):
+        """
+        Runs stage(df) on the current thread and returns everything it printed.
+        """
+
+        self.local.buffer = io.StringIO()
+        try:
+            stage(df)
+            return self.local.buffer.getvalue()
+        finally:
+            self.local.buffer = None
+
+def run_stages_in_parallel(df, stages):
+    """
+    Runs inspection stages on a thread pool and prints their output in the given order.
+
+    Args:
+        df (pd.dfFrame): The dfFrame to inspect.
+        stages (tuple): Functions taking the df that print their results.
+    """
+
+    stdout = sys.stdout
+    output = ThreadOutput(stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            futures = [executor.submit(output.capture, stage, df) for stage in stages]
+            results = [future.result() for future in futures]
+    finally:
+        sys.stdout = stdout
+
+    for result in results:
+        print(result, end="")
+
 def print_basic_info(df):
     """
     Prints basic information about the df.
@@ -164,19 +299,71 @@ def check_missing_values(df):
     """
 
     print("Number of missing values in each column:")
-    print(df.isnull().sum())
+    # count() tallies non-null values directly, without an intermediate isnull() frame
+    print(len(df) - df.count())
 
-def print_summary_stats(df):
+def print_summary_stats(df, num_view=None):
     """
     Prints summary statistics for numerical columns in the df.
 
     Args:
         df (pd.dfFrame): The dfFrame to inspect.
+        num_view (pd.dfFrame, optional): The numerical columns of df, if already selected.
     """
 
-    numerical_cols = df.select_dtypes(include=np.number).columns
+    if num_view is None:
+        num_view = df.select_dtypes(include=np.number)
     print("Summary statistics for numerical columns:")
-    print(df[numerical_cols].describe())
+    print(num_view.describe())
+
+def hash_column(arr, split_missing=False):
+    """
+    Hashes each value of a column so that values duplicated() treats as equal hash equally.
+
+    Float columns are hashed by value once -0.0 is folded into 0.0. Object and other
+    columns are hashed by their factorize codes, which compare values the way pandas
+    does: 1 and "1" stay distinct, while 1 and 1.0 match.
+
+    Args:
+        arr (np.ndarray): The column values, e.g. from `df[col].to_numpy()`.
+        split_missing (bool, optional): Keep missing values of different kinds apart
+            (None matches None and NaN matches NaN, but not each other). DataFrame.duplicated()
+            does this only for single-column frames; with several columns all missing values match.
+
+    Returns:
+        np.ndarray: A uint64 hash per value.
+    """
+
+    if arr.dtype.kind == "f":
+        return pd.util.hash_array(arr + 0.0)
+    if arr.dtype.kind in "biu":
+        return pd.util.hash_array(arr)
+    codes, _ = pd.factorize(arr)
+    missing = np.flatnonzero(codes == -1) if split_missing else ()
+    if len(missing):
+        # factorize gives every missing value code -1; split them by kind
+        kinds = {}
+        codes[missing] = [-1 - kinds.setdefault(type(value), len(kinds)) for value in arr[missing]]
+    return pd.util.hash_array(codes)
+
+def hash_rows(df):
+    """
+    Hashes each row of a DataFrame from its column hashes (see hash_column), so rows
+    that duplicated() treats as equal hash equally.
+
+    Args:
+        df (pd.dfFrame): The dfFrame to hash.
+
+    Returns:
+        np.ndarray: A uint64 hash per row.
+    """
+
+    split_missing = df.shape[1] == 1  # As DataFrame.duplicated() does
+    row_hashes = np.zeros(df.shape[0], dtype=np.uint64)
+    for j in range(df.shape[1]):
+        # Order-dependent combine so rows with the same values in different columns differ
+        row_hashes = row_hashes * np.uint64(1000003) ^ hash_column(df.iloc[:, j].to_numpy(), split_missing)
+    return row_hashes
 
 def check_duplicate_rows(df):
     """
@@ -187,25 +374,28 @@ def check_duplicate_rows(df):
     """
 
     print("Number of duplicate rows:")
-    print(df.duplicated().sum())
+    # Count distinct row hashes instead of materializing a boolean duplicated() mask
+    row_hashes = hash_rows(df)
+    print(len(row_hashes) - np.unique(row_hashes).size)
 
-def check_outliers(df):
+def check_outliers(df, num_view=None):
     """
     Checks for outliers in the df using z-scores and box plots.
 
     Args:
         df (pd.dfFrame): The dfFrame to inspect.
+        num_view (pd.dfFrame, optional): The numerical columns of df, if already selected.
     """
 
+    if num_view is None:
+        num_view = df.select_dtypes(include=np.number)
     print("Potential outliers based on z-scores:")
-    z_scores = df.apply(stats.zscore)
-    outliers = df[(z_scores.abs() > 3).any(axis=1)]
+    outliers = df[zscore_outlier_mask(numeric_matrix(num_view), 3.0)]
     print(outliers)
 
     print("Box plots for numerical columns:")
-    numerical_cols = df.select_dtypes(include=np.number).columns
-    if numerical_cols:
-        df[numerical_cols].plot(kind="box", subplots=True, layout=(1, -1), figsize=(10, 5))
+    if not num_view.columns.empty:
+        num_view.plot(kind="box", subplots=True, layout=(1, -1), figsize=(10, 5))
     else:
         print("No numerical columns found.")
     plt.show()
@@ -250,23 +440,26 @@ def check_skewness(df, columns_for_skewness):
     """
 
     print("Columns with skewed distributions:")
-    skewed_columns = df[columns_for_skewness].select_dtypes(include=np.number).apply(lambda x: x.skew())
-    skewed_columns = skewed_columns[abs(skewed_columns) > 0.5]
+    # select_dtypes rather than numeric_only=True, which would also include bool columns
+    skewed_columns = df[columns_for_skewness].select_dtypes(include=np.number).skew()
+    skewed_columns = skewed_columns[skewed_columns.abs() > 0.5]
     print(skewed_columns)
 
-def perform_visual_exploration(df):
+def perform_visual_exploration(df, num_view=None):
     """
     Performs visual exploration of the df.
 
     Args:
         df (pd.dfFrame): The dfFrame to inspect.
+        num_view (pd.dfFrame, optional): The numerical columns of df, if already selected.
     """
 
     print("Visual exploration of the df:")
     # Example: histograms for numerical columns
-    numerical_cols = df.select_dtypes(include=np.number).columns
-    if numerical_cols:
-        df[numerical_cols].hist(bins=10, figsize=(10, 10))
+    if num_view is None:
+        num_view = df.select_dtypes(include=np.number)
+    if not num_view.columns.empty:
+        num_view.hist(bins=10, figsize=(10, 10))
         plt.show()
     # Add more visualizations as needed (scatter plots, line plots, etc.)
 
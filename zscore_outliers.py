@@ -0,0 +1,163 @@
+import numpy as np
+from numba import guvectorize, njit, prange
+
+
+# fastmath without the no-NaN/no-Inf assumptions, so missing values still
+# compare as "not an outlier" instead of producing undefined results
+FASTMATH = {"reassoc", "contract", "arcp", "nsz", "afn"}
+
+# Numeric matrices larger than this many cells are scanned in float32 to halve memory traffic
+FLOAT32_MIN_CELLS = 1_000_000
+
+# Above SAMPLE_MIN_ROWS rows the column statistics are estimated from SAMPLE_SIZE random rows
+SAMPLE_MIN_ROWS = 200_000
+SAMPLE_SIZE = 100_000
+# Columns with fewer non-NaN values than this in the sample use statistics from the full column
+SAMPLE_MIN_VALUES = 1_000
+
+
+def numeric_matrix(numeric_df):
+    """
+    Converts a DataFrame of numeric columns to a C-contiguous array for the kernels below.
+
+    Args:
+        numeric_df (pd.DataFrame): The numeric columns, e.g. `df.select_dtypes(include=np.number)`.
+
+    Returns:
+        np.ndarray: float64 array of shape (n_rows, n_numeric_cols), or float32 when it
+            has more than FLOAT32_MIN_CELLS cells.
+    """
+
+    dtype = np.float32 if numeric_df.size > FLOAT32_MIN_CELLS else np.float64
+    return np.ascontiguousarray(numeric_df.to_numpy(dtype=dtype, copy=False))
+
+
+def zscore_outlier_mask(X, threshold):
+    """
+    Flags rows that contain at least one value whose absolute z-score exceeds the threshold.
+    Missing values (NaN) are left out of the column statistics and are never outliers,
+    like scipy.stats.zscore(..., nan_policy="omit").
+
+    For matrices with more than SAMPLE_MIN_ROWS rows the column means and standard
+    deviations are estimated from a sample (see zscore_stats); the threshold is still
+    applied to every row.
+
+    Args:
+        X (np.ndarray): C-contiguous float32 or float64 array of shape (n_rows, n_cols),
+            e.g. from numeric_matrix.
+        threshold (float): The absolute z-score above which a value is an outlier.
+
+    Returns:
+        np.ndarray: Boolean array of shape (n_rows,), True for outlier rows.
+    """
+
+    mu, sd = zscore_stats(X)
+    return outlier_rows(X, mu, sd, threshold)
+
+
+def zscore_stats(X):
+    """
+    Computes the column statistics used for z-scores, estimating them from a fixed-seed
+    random sample of SAMPLE_SIZE rows when X has more than SAMPLE_MIN_ROWS rows.
+    Sparse columns, with fewer than SAMPLE_MIN_VALUES non-NaN values in the sample,
+    are computed from the full column instead, so they are never judged against the
+    all-NaN fallback statistics.
+
+    A sparse column whose few values are close together has no outliers:
+
+    >>> X = np.full((300_000, 1), np.nan)
+    >>> X[10, 0], X[20, 0] = 1000.0, 1001.0
+    >>> mu, sd = zscore_stats(X)
+    >>> float(mu[0]), float(sd[0])
+    (1000.5, 0.5)
+    >>> int(zscore_outlier_mask(X, 3.0).sum())
+    0
+
+    Args:
+        X (np.ndarray): Array of shape (n_rows, n_cols).
+
+    Returns:
+        tuple: (mu, sd) as returned by column_stats.
+    """
+
+    if X.shape[0] <= SAMPLE_MIN_ROWS:
+        return column_stats(X)
+
+    rows = np.sort(np.random.default_rng(0).choice(X.shape[0], SAMPLE_SIZE, replace=False))
+    sample = X[rows]
+    mu, sd = column_stats(sample)
+    sparse = np.flatnonzero(np.count_nonzero(~np.isnan(sample), axis=0) < SAMPLE_MIN_VALUES)
+    if sparse.size:
+        mu[sparse], sd[sparse] = column_stats(np.ascontiguousarray(X[:, sparse]))
+    return mu, sd
+
+
+@njit(parallel=True, fastmath=FASTMATH, cache=True)
+def column_stats(X):
+    """
+    Computes the column means and population standard deviations (ddof=0) of X, ignoring NaN.
+
+    Sums are accumulated in float64 but the results are returned in X's dtype, so the
+    compare in outlier_rows stays in float32 for float32 input. Constant and all-NaN
+    columns get a standard deviation of 1 so they never flag outliers.
+
+    Args:
+        X (np.ndarray): Array of shape (n_rows, n_cols).
+
+    Returns:
+        tuple: (mu, sd), each an array of shape (n_cols,).
+    """
+
+    n, m = X.shape
+    mu = np.empty(m, dtype=X.dtype)
+    sd = np.empty(m, dtype=X.dtype)
+    for j in prange(m):
+        count = 0
+        s = 0.0
+        for i in range(n):
+            if not np.isnan(X[i, j]):
+                count += 1
+                s += X[i, j]
+        mean = s / count if count > 0 else 0.0
+        s2 = 0.0
+        for i in range(n):
+            if not np.isnan(X[i, j]):
+                d = X[i, j] - mean
+                s2 += d * d
+        std = np.sqrt(s2 / count) if count > 0 else 0.0
+        mu[j] = mean
+        sd[j] = std if std != 0 else 1.0
+    return mu, sd
+
+
+@guvectorize(
+    ["void(f8[:], f8[:], f8[:], f8, b1[:])", "void(f4[:], f4[:], f4[:], f8, b1[:])"],
+    "(m),(m),(m),()->()",
+    nopython=True,
+    target="parallel",
+    fastmath=FASTMATH,
+)
+def outlier_rows(x, mu, sd, threshold, out):
+    """
+    Flags a row x when any |x[j] - mu[j]| / sd[j] is above the threshold.
+
+    A parallel NumPy gufunc with layout (m),(m),(m),()->(): each kernel call sees one row
+    of m values and writes one boolean to out[0]. Callers pass the whole matrix,
+    outlier_rows(X, mu, sd, threshold) with X of shape (n_rows, n_cols), and NumPy
+    broadcasts the kernel over the rows (threaded by target="parallel"), returning a
+    boolean array of shape (n_rows,). The float32 and float64 signatures are compiled
+    once at import, so calls never re-JIT.
+
+    Args:
+        x (np.ndarray): One row, shape (m,).
+        mu (np.ndarray): Column means, shape (m,), with the same dtype as x.
+        sd (np.ndarray): Non-zero column standard deviations, shape (m,), with the same dtype as x.
+        threshold (float): The absolute z-score above which a value is an outlier.
+        out (np.ndarray): Output slot for this row, set True if the row has an outlier.
+    """
+
+    out[0] = False
+    for j in range(x.shape[0]):
+        if abs((x[j] - mu[j]) / sd[j]) > threshold:
+            out[0] = True
+            break